@@ -2,18 +2,40 @@ from __future__ import annotations
 
 import random
 import time
+from bisect import bisect_left, insort
+from collections import deque
 from dataclasses import dataclass, field
-from itertools import combinations
+from itertools import islice
 from typing import Any
 
-from treys import Card, Deck, Evaluator
+from treys import Card, Evaluator
+
+# All 52 cards as treys ints; Table reshuffles its own copy each hand instead of building a Deck.
+_DECK_INTS: tuple[int, ...] = tuple(Card.new(rank + suit) for rank in Card.STR_RANKS for suit in "shdc")
+
+# Evaluator holds no per-hand state; share one instance.
+_EVAL = Evaluator()
+
+
+def _card_html(c: str) -> str:
+    rank = c[:-1].upper()
+    suit = c[-1].lower()
+    suit_map = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
+    if rank == 'T':
+        rank = '10'
+    color = '#ff8585' if suit in 'hd' else 'inherit'
+    return f'<span style="color:{color};font-weight:700;">{rank}{suit_map.get(suit, suit)}</span>'
+
+
+# Only 52 possible inputs, so render them all once.
+_CARD_HTML: dict[str, str] = {Card.int_to_str(c): _card_html(Card.int_to_str(c)) for c in _DECK_INTS}
 
 
 class RoomError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     sid: str
     name: str
@@ -24,6 +46,8 @@ class Player:
     ready: bool = False
 
     hand: list[str] = field(default_factory=list)
+    hand_ints: list[int] = field(default_factory=list)  # treys ints for hand
+    hand_html: str = ""  # rendered hand for the showdown log
 
     bet: int = 0  # bet in current betting round
     total_bet: int = 0  # total bet in this hand
@@ -33,6 +57,9 @@ class Player:
 
     last_action: str | None = None
 
+    synced_rev: int | None = None  # room state_rev this player's client is in sync with
+    synced_hand_no: int | None = None  # hand_no of the last private_state sent
+
 
 @dataclass
 class HandResult:
@@ -41,6 +68,15 @@ class HandResult:
     ranking: list[tuple[int, int]]  # (seat, score) lower is better
 
 
+@dataclass
+class StateDelta:
+    rev: int
+    changed: dict[str, Any]  # top-level state keys that differ from the previous delta
+    logs: list[dict[str, Any]]  # log entries added since the previous delta
+    chat: list[dict[str, Any]]  # chat entries added since the previous delta
+    state: dict[str, Any]  # full table state this delta was computed from (not sent)
+
+
 class Table:
     def __init__(self, *, small_blind: int = 5, big_blind: int = 10):
         self.small_blind = small_blind
@@ -54,6 +90,7 @@ class Table:
 
         self.stage = "waiting"  # waiting|preflop|flop|turn|river|showdown
         self.board: list[str] = []
+        self.board_ints: list[int] = []  # treys ints for board
         self.pot = 0
 
         self.dealer_seat: int | None = None
@@ -65,50 +102,59 @@ class Table:
         self.current_bet = 0
         self.min_raise = self.big_blind
 
-        self._to_act: list[int] = []
-        self._deck: Deck | None = None
+        # Seats still to act this round: _act_cycle[_act_idx:]; the head is action_seat.
+        self._act_cycle: list[int] = []
+        self._act_idx = 0
+
+        self._seats_in_hand: list[int] = []  # sorted; fixed at start_hand, minus players who leave
+
+        # Per-hand counts of non-folded players by state, kept up to date by
+        # apply_action so the end-of-round checks don't rescan every player.
+        self._n_folded = 0
+        self._n_all_in = 0  # not folded
+        self._n_matched = 0  # not folded, not all-in, bet == current_bet
+
+        self._deck_list: list[int] | None = None
+        self._deck_pos = 0
 
         self.last_log: str | None = None
 
         self.showdown_reveal: dict[int, list[str]] = {}  # seat -> cards
 
+    # Seat helpers take an already-sorted seat list.
     @staticmethod
-    def _seat_order(seats: list[int], start_seat: int) -> list[int]:
-        if not seats:
+    def _seat_index(order: list[int], seat: int) -> int | None:
+        idx = bisect_left(order, seat)
+        if idx < len(order) and order[idx] == seat:
+            return idx
+        return None
+
+    @staticmethod
+    def _seat_order(seats_sorted: list[int], start_seat: int) -> list[int]:
+        if not seats_sorted:
             return []
-        seats_sorted = sorted(seats)
-        start_idx = seats_sorted.index(start_seat) if start_seat in seats_sorted else 0
+        start_idx = Table._seat_index(seats_sorted, start_seat) or 0
         return seats_sorted[start_idx:] + seats_sorted[:start_idx]
 
     @staticmethod
-    def _next_seat(seats: list[int], current: int) -> int:
-        order = sorted(seats)
+    def _next_seat(order: list[int], current: int) -> int:
         if not order:
             raise RoomError("no seats")
-        if current not in order:
+        idx = Table._seat_index(order, current)
+        if idx is None:
             return order[0]
-        idx = order.index(current)
         return order[(idx + 1) % len(order)]
 
     @staticmethod
-    def _prev_seat(seats: list[int], current: int) -> int:
-        order = sorted(seats)
+    def _prev_seat(order: list[int], current: int) -> int:
         if not order:
             raise RoomError("no seats")
-        if current not in order:
+        idx = Table._seat_index(order, current)
+        if idx is None:
             return order[-1]
-        idx = order.index(current)
         return order[(idx - 1) % len(order)]
 
-    @staticmethod
-    def _format_card_html(c: str) -> str:
-        rank = c[:-1].upper()
-        suit = c[-1].lower()
-        suit_map = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
-        if rank == 'T':
-            rank = '10'
-        color = '#ff8585' if suit in 'hd' else 'inherit'
-        return f'<span style="color:{color};font-weight:700;">{rank}{suit_map.get(suit, suit)}</span>'
+    _format_card_html = staticmethod(_CARD_HTML.__getitem__)
 
     def _active_seats(self, players_by_seat: dict[int, Player]) -> list[int]:
         return [
@@ -126,44 +172,72 @@ class Table:
         seat = seat_of_sid.get(sid)
         if seat is None:
             raise RoomError("你还未加入房间")
+        if seat not in players_by_seat:
+            raise RoomError("你不在本局中")
         if seat != self.action_seat:
             raise RoomError("还没轮到你")
         if players_by_seat[seat].folded:
             raise RoomError("你已弃牌")
 
     def _start_betting_round(self, players_by_seat: dict[int, Player], first_to_act: int):
-        self.current_bet = max(p.bet for p in players_by_seat.values()) if players_by_seat else 0
+        # current_bet is already set by start_hand (blinds) or _reset_round_bets.
         self.min_raise = max(self.big_blind, self.min_raise)
 
-        seats = [seat for seat, p in players_by_seat.items() if not p.folded and not p.all_in]
-        if not seats:
-            self._to_act = []
-            self.action_seat = None
-            return
+        seats = [
+            seat
+            for seat in self._seats_in_hand
+            if not players_by_seat[seat].folded and not players_by_seat[seat].all_in
+        ]
+        self._set_to_act(self._seat_order(seats, first_to_act))
+
+    def _tally(self, p: Player, delta: int):
+        if p.folded:
+            self._n_folded += delta
+        elif p.all_in:
+            self._n_all_in += delta
+        elif p.bet == self.current_bet:
+            self._n_matched += delta
+
+    def _count_matched(self, players_by_seat: dict[int, Player]):
+        self._n_matched = sum(
+            1 for p in players_by_seat.values() if not p.folded and not p.all_in and p.bet == self.current_bet
+        )
+
+    def drop_player(self, p: Player):
+        # Called when a seated player leaves mid-hand without being folded by apply_action.
+        self._tally(p, -1)
+        idx = self._seat_index(self._seats_in_hand, p.seat)
+        if idx is not None:
+            del self._seats_in_hand[idx]
 
-        order = self._seat_order(seats, first_to_act)
-        self._to_act = order
-        self.action_seat = self._to_act[0]
+    def _set_to_act(self, order: list[int]):
+        self._act_cycle = order
+        self._act_idx = 0
+        self.action_seat = order[0] if order else None
 
-    def _remove_from_to_act(self, seat: int):
-        if seat in self._to_act:
-            self._to_act.remove(seat)
-        self.action_seat = self._to_act[0] if self._to_act else None
+    def _advance_to_act(self):
+        # Only the acting seat (the head) ever leaves the queue, so just move the index.
+        self._act_idx += 1
+        self.action_seat = self._act_cycle[self._act_idx] if self._act_idx < len(self._act_cycle) else None
 
     def _reset_round_bets(self, players_by_seat: dict[int, Player]):
         for p in players_by_seat.values():
             p.bet = 0
         self.current_bet = 0
         self.min_raise = self.big_blind
+        self._count_matched(players_by_seat)
 
-    def _deal(self, n: int) -> list[str]:
-        if self._deck is None:
+    def _deal(self, n: int) -> tuple[list[str], list[int]]:
+        if self._deck_list is None:
             raise RoomError("牌堆未准备")
-        cards: list[str] = []
-        for _ in range(n):
-            c = self._deck.draw(1)[0]
-            cards.append(Card.int_to_str(c))
-        return cards
+        ints = self._deck_list[self._deck_pos:self._deck_pos + n]
+        self._deck_pos += n
+        return [Card.int_to_str(c) for c in ints], ints
+
+    def _deal_board(self, n: int):
+        cards, ints = self._deal(n)
+        self.board += cards
+        self.board_ints += ints
 
     def _post_blind(self, p: Player, amount: int) -> int:
         pay = min(amount, p.chips)
@@ -173,29 +247,39 @@ class Table:
         self.pot += pay
         if p.chips == 0:
             p.all_in = True
+            self._n_all_in += 1
         return pay
 
-    def start_hand(self, players_by_seat: dict[int, Player]):
-        seats_in_room = sorted(players_by_seat.keys())
+    def start_hand(self, players_by_seat: dict[int, Player], seats_in_room: list[int]):
         if len(seats_in_room) < 2:
             raise RoomError("至少需要 2 名玩家")
+        self._seats_in_hand = list(seats_in_room)
 
         self.started = True
         self.hand_no += 1
         self.stage = "preflop"
         self.board = []
+        self.board_ints = []
         self.pot = 0
         self.showdown_reveal = {}
 
-        self._deck = Deck()
+        # Reuse the same list across hands; a shuffle of it is always a full deck.
+        if self._deck_list is None:
+            self._deck_list = list(_DECK_INTS)
+        random.shuffle(self._deck_list)
+        self._deck_pos = 0
 
         for p in players_by_seat.values():
             p.hand = []
+            p.hand_ints = []
+            p.hand_html = ""
             p.bet = 0
             p.total_bet = 0
             p.folded = False
             p.all_in = False
             p.last_action = None
+        self._n_folded = 0
+        self._n_all_in = 0
 
         # Move dealer button
         if self.dealer_seat is None:
@@ -205,7 +289,9 @@ class Table:
 
         # Deal hole cards
         for seat in self._seat_order(seats_in_room, self._next_seat(seats_in_room, self.dealer_seat)):
-            players_by_seat[seat].hand = self._deal(2)
+            p = players_by_seat[seat]
+            p.hand, p.hand_ints = self._deal(2)
+            p.hand_html = ' '.join(self._format_card_html(c) for c in p.hand)
 
         # Post blinds
         if len(seats_in_room) == 2:
@@ -223,6 +309,7 @@ class Table:
 
         self.current_bet = max(sb_paid, bb_paid)
         self.min_raise = self.big_blind
+        self._count_matched(players_by_seat)
 
         # First to act preflop
         if len(seats_in_room) == 2:
@@ -236,16 +323,16 @@ class Table:
         self._start_betting_round(players_by_seat, first)
 
     def _advance_stage(self, players_by_seat: dict[int, Player]):
-        seats_in_room = sorted(players_by_seat.keys())
+        seats_in_room = self._seats_in_hand
         if self.stage == "preflop":
             self.stage = "flop"
-            self.board += self._deal(3)
+            self._deal_board(3)
         elif self.stage == "flop":
             self.stage = "turn"
-            self.board += self._deal(1)
+            self._deal_board(1)
         elif self.stage == "turn":
             self.stage = "river"
-            self.board += self._deal(1)
+            self._deal_board(1)
         elif self.stage == "river":
             self.stage = "showdown"
         else:
@@ -262,27 +349,18 @@ class Table:
             self._start_betting_round(players_by_seat, first)
 
     def _maybe_finish_early(self, players_by_seat: dict[int, Player]) -> bool:
-        in_hand = [seat for seat, p in players_by_seat.items() if not p.folded]
-        if len(in_hand) == 1:
-            winner_seat = in_hand[0]
+        if len(players_by_seat) - self._n_folded == 1:
+            winner_seat = next(seat for seat, p in players_by_seat.items() if not p.folded)
             players_by_seat[winner_seat].chips += self.pot
             self.last_log = f"座位 {winner_seat} 赢得底池 {self.pot}（其他人弃牌）"
             self.stage = "waiting"
             self.started = False
-            self.action_seat = None
-            self._to_act = []
+            self._set_to_act([])
             return True
         return False
 
     def _all_active_all_in_or_matched(self, players_by_seat: dict[int, Player]) -> bool:
-        for p in players_by_seat.values():
-            if p.folded:
-                continue
-            if p.all_in:
-                continue
-            if p.bet != self.current_bet:
-                return False
-        return True
+        return self._n_folded + self._n_all_in + self._n_matched == len(players_by_seat)
 
     def _auto_run_if_all_in(self, players_by_seat: dict[int, Player]):
         # If everyone remaining is all-in or matched and nobody needs to act, deal remaining streets.
@@ -296,10 +374,9 @@ class Table:
             if self.stage == "showdown":
                 break
             # If no one can act (all-in), keep dealing.
-            if any((not p.folded and not p.all_in) for p in players_by_seat.values()):
+            if self._n_folded + self._n_all_in < len(players_by_seat):
                 break
-            self.action_seat = None
-            self._to_act = []
+            self._set_to_act([])
 
     def apply_action(
         self,
@@ -320,10 +397,12 @@ class Table:
         action_type = (action_type or "").lower().strip()
 
         if action_type == "fold":
+            self._tally(p, -1)
             p.folded = True
+            self._tally(p, 1)
             p.last_action = "fold"
             self.last_log = f"{p.name} 弃牌"
-            self._remove_from_to_act(seat)
+            self._advance_to_act()
             if self._maybe_finish_early(players_by_seat):
                 return
 
@@ -332,20 +411,22 @@ class Table:
                 raise RoomError("不能过牌，需要跟注或弃牌")
             p.last_action = "check"
             self.last_log = f"{p.name} 过牌"
-            self._remove_from_to_act(seat)
+            self._advance_to_act()
 
         elif action_type == "call":
             need = max(0, self.current_bet - p.bet)
             pay = min(need, p.chips)
+            self._tally(p, -1)
             p.chips -= pay
             p.bet += pay
             p.total_bet += pay
             self.pot += pay
             if p.chips == 0 and need > 0:
                 p.all_in = True
+            self._tally(p, 1)
             p.last_action = "call" if need > 0 else "check"
             self.last_log = f"{p.name} 跟注 {pay}" if need > 0 else f"{p.name} 过牌"
-            self._remove_from_to_act(seat)
+            self._advance_to_act()
 
         elif action_type == "raise":
             if amount is None:
@@ -359,15 +440,17 @@ class Table:
                 # Treat as call
                 need = max(0, self.current_bet - p.bet)
                 pay = min(need, p.chips)
+                self._tally(p, -1)
                 p.chips -= pay
                 p.bet += pay
                 p.total_bet += pay
                 self.pot += pay
                 if p.chips == 0 and need > 0:
                     p.all_in = True
+                self._tally(p, 1)
                 p.last_action = "call" if need > 0 else "check"
                 self.last_log = f"{p.name} calls {pay}" if need > 0 else f"{p.name} checks"
-                self._remove_from_to_act(seat)
+                self._advance_to_act()
             else:
                 if raise_to > p.bet + p.chips:
                     raise RoomError("筹码不足")
@@ -385,9 +468,11 @@ class Table:
                 self.pot += delta
                 if p.chips == 0:
                     p.all_in = True
+                    self._n_all_in += 1
 
                 self.min_raise = max(self.min_raise, raise_to - self.current_bet)
                 self.current_bet = raise_to
+                self._count_matched(players_by_seat)
 
                 p.last_action = "raise"
                 self.last_log = f"{p.name} 加注到 {raise_to}"
@@ -395,22 +480,19 @@ class Table:
                 # Reset to_act: everyone else who can still act
                 seats_can_act = [
                     s
-                    for s, pl in players_by_seat.items()
-                    if s != seat and not pl.folded and not pl.all_in
+                    for s in self._seats_in_hand
+                    if s != seat and not players_by_seat[s].folded and not players_by_seat[s].all_in
                 ]
                 if seats_can_act:
-                    order = self._seat_order(seats_can_act, self._next_seat(sorted(players_by_seat.keys()), seat))
-                    self._to_act = order
-                    self.action_seat = self._to_act[0]
+                    self._set_to_act(self._seat_order(seats_can_act, self._next_seat(self._seats_in_hand, seat)))
                 else:
-                    self._to_act = []
-                    self.action_seat = None
+                    self._set_to_act([])
 
         else:
             raise RoomError("未知操作")
 
         # End betting round?
-        if not self._to_act and self.started and self.stage in ("preflop", "flop", "turn", "river"):
+        if self.action_seat is None and self.started and self.stage in ("preflop", "flop", "turn", "river"):
             self._advance_stage(players_by_seat)
 
         self._auto_run_if_all_in(players_by_seat)
@@ -419,9 +501,8 @@ class Table:
         if self.stage != "showdown":
             raise RoomError("尚未进入摊牌")
 
-        evaluator = Evaluator()
+        evaluator = _EVAL
 
-        board = [Card.new(c) for c in self.board]
         contenders = [seat for seat, p in players_by_seat.items() if not p.folded]
         if len(contenders) == 1:
             winner = contenders[0]
@@ -432,29 +513,42 @@ class Table:
         # Scores
         scores: dict[int, int] = {}
         for seat in contenders:
-            hand = [Card.new(c) for c in players_by_seat[seat].hand]
-            scores[seat] = evaluator.evaluate(board, hand)
+            scores[seat] = evaluator.evaluate(self.board_ints, players_by_seat[seat].hand_ints)
 
         ranking = sorted(((seat, score) for seat, score in scores.items()), key=lambda x: x[1])
 
         # Side pots based on total_bet from all players (including folded)
         totals = {seat: p.total_bet for seat, p in players_by_seat.items()}
-        levels = sorted({t for t in totals.values() if t > 0})
-
-        payouts: dict[int, int] = {seat: 0 for seat in players_by_seat.keys()}
+        # Walk seats by total_bet once; everyone from index i onward put in
+        # at least this level, so each new level is one pot layer.
+        sorted_players = sorted(totals.items(), key=lambda kv: kv[1])
+        layers: list[tuple[int, int]] = []  # (first contributor index, pot amount)
         prev = 0
-        for level in levels:
-            contributors = [seat for seat, t in totals.items() if t >= level]
-            pot_amount = (level - prev) * len(contributors)
-            prev = level
+        for i, (_, level) in enumerate(sorted_players):
+            if level > prev:
+                layers.append((i, (level - prev) * (len(sorted_players) - i)))
+                prev = level
 
-            eligible = [seat for seat in contributors if seat in contenders]
-            if not eligible:
+        # Settle layers from the top down so the eligible contenders (and the
+        # best among them) only ever grow: each seat is looked at once.
+        payouts: dict[int, int] = {seat: 0 for seat in players_by_seat.keys()}
+        best_score: int | None = None
+        winners: list[int] = []
+        j = len(sorted_players)
+        for i, pot_amount in reversed(layers):
+            while j > i:
+                j -= 1
+                seat = sorted_players[j][0]
+                if seat not in scores:
+                    continue
+                if best_score is None or scores[seat] < best_score:
+                    best_score = scores[seat]
+                    winners = [seat]
+                elif scores[seat] == best_score:
+                    winners.append(seat)
+            if not winners:
                 continue
 
-            best_score = min(scores[s] for s in eligible)
-            winners = [s for s in eligible if scores[s] == best_score]
-
             share = pot_amount // len(winners)
             remainder = pot_amount - share * len(winners)
 
@@ -485,33 +579,42 @@ class GameRoom:
         self.room_id = room_id
         self.players: dict[str, Player] = {}  # sid -> Player
         self.table = Table()
-        self.logs: list[dict[str, Any]] = []
-        self.chat: list[dict[str, Any]] = []
-
-    def _players_by_seat(self) -> dict[int, Player]:
-        return {p.seat: p for p in self.players.values()}
-
-    def _seat_of_sid(self) -> dict[str, int]:
-        return {sid: p.seat for sid, p in self.players.items()}
+        self.logs: deque[dict[str, Any]] = deque(maxlen=200)
+        self.chat: deque[dict[str, Any]] = deque(maxlen=200)
+
+        # Seat indexes, maintained by add_player/remove_player.
+        self._by_seat: dict[int, Player] = {}
+        self._seat_of_sid: dict[str, int] = {}
+        self._sorted_seats: list[int] = []
+        # Players dealt into the current hand; Table only ever sees these, so
+        # anyone who joins mid-hand sits out until the next deal.
+        self._hand_players: dict[int, Player] = {}
+
+        # Broadcast bookkeeping for delta().
+        self.state_rev = 0
+        self._last_state: dict[str, Any] = {}
+        self._new_logs: list[dict[str, Any]] = []
+        self._new_chat: list[dict[str, Any]] = []
 
     def _next_free_seat(self) -> int:
-        used = {p.seat for p in self.players.values()}
         for seat in range(1, 10):
-            if seat not in used:
+            if seat not in self._by_seat:
                 return seat
         raise RoomError("座位已满")
 
     def add_log(self, message: str):
-        self.logs.append({"t": int(time.time()), "msg": message})
-        self.logs = self.logs[-200:]
+        entry = {"t": int(time.time()), "msg": message}
+        self.logs.append(entry)
+        self._new_logs.append(entry)
 
     def add_chat(self, sid: str, text: str):
         text = (text or "").strip()
         if not text:
             return
         name = self.players.get(sid).name if sid in self.players else "?"
-        self.chat.append({"t": int(time.time()), "name": name, "text": text[:300]})
-        self.chat = self.chat[-200:]
+        entry = {"t": int(time.time()), "name": name, "text": text[:300]}
+        self.chat.append(entry)
+        self._new_chat.append(entry)
 
     def add_player(self, *, sid: str, name: str | None) -> Player:
         name = (name or "").strip() or f"Player{random.randint(100, 999)}"
@@ -522,6 +625,9 @@ class GameRoom:
         seat = self._next_free_seat()
         p = Player(sid=sid, name=name, seat=seat)
         self.players[sid] = p
+        self._by_seat[seat] = p
+        self._seat_of_sid[sid] = seat
+        insort(self._sorted_seats, seat)
         return p
 
     def buyin(self, *, sid: str, amount: int = 1000):
@@ -542,26 +648,32 @@ class GameRoom:
         if sid not in self.players:
             return
 
-        # If a hand is running and it's the leaving player's turn, auto-fold.
-        leaving_seat = self.players[sid].seat
-        players_by_seat = self._players_by_seat()
-        seat_of_sid = self._seat_of_sid()
-
-        if self.table.started and self.table.action_seat == leaving_seat:
-            try:
-                self.table.apply_action(
-                    sid=sid,
-                    action_type="fold",
-                    amount=None,
-                    players_by_seat=players_by_seat,
-                    seat_of_sid=seat_of_sid,
-                )
-                if self.table.last_log:
-                    self.add_log(self.table.last_log)
-            except Exception:
-                pass
+        leaving = self.players[sid]
+        leaving_seat = leaving.seat
+
+        # Between hands there is no table state to update; just drop the indexes.
+        if self.table.started and leaving_seat in self._hand_players:
+            # If it's the leaving player's turn, auto-fold.
+            if self.table.action_seat == leaving_seat:
+                try:
+                    self.table.apply_action(
+                        sid=sid,
+                        action_type="fold",
+                        amount=None,
+                        players_by_seat=self._hand_players,
+                        seat_of_sid=self._seat_of_sid,
+                    )
+                    if self.table.last_log:
+                        self.add_log(self.table.last_log)
+                except Exception:
+                    pass
+            self.table.drop_player(leaving)
+            del self._hand_players[leaving_seat]
 
         del self.players[sid]
+        del self._by_seat[leaving_seat]
+        del self._seat_of_sid[sid]
+        self._sorted_seats.remove(leaving_seat)
 
     def toggle_ready(self, sid: str):
         if sid not in self.players:
@@ -577,21 +689,20 @@ class GameRoom:
         if not all(p.ready for p in self.players.values()):
             raise RoomError("还有玩家未准备")
 
-        players_by_seat = self._players_by_seat()
-        self.table.start_hand(players_by_seat)
+        self._hand_players = dict(self._by_seat)
+        self.table.start_hand(self._hand_players, self._sorted_seats)
         self.add_log(f"第 {self.table.hand_no} 局开始")
         self.add_log(f"阶段：{self.table.stage}")
 
     def player_action(self, *, sid: str, action_type: str, amount: int | None):
-        players_by_seat = self._players_by_seat()
-        seat_of_sid = self._seat_of_sid()
+        players_by_seat = self._hand_players
 
         self.table.apply_action(
             sid=sid,
             action_type=action_type,
             amount=amount,
             players_by_seat=players_by_seat,
-            seat_of_sid=seat_of_sid,
+            seat_of_sid=self._seat_of_sid,
         )
 
         if self.table.last_log:
@@ -600,7 +711,6 @@ class GameRoom:
         if self.table.stage == "showdown":
             result = self.table.finish_showdown(players_by_seat)
 
-            evaluator = Evaluator()
             class_zh = {
                 "High Card": "高牌",
                 "Pair": "一对",
@@ -614,30 +724,17 @@ class GameRoom:
                 "Royal Flush": "皇家同花顺",
             }
 
-            def best_five_cards(seat: int) -> list[int]:
-                board_ints = [Card.new(c) for c in self.table.board]
-                hand_ints = [Card.new(c) for c in players_by_seat[seat].hand]
-                seven = board_ints + hand_ints
-                best_combo: tuple[int, ...] | None = None
-                best_rank = 10**9
-                for combo in combinations(seven, 5):
-                    r = evaluator._five(list(combo))
-                    if r < best_rank:
-                        best_rank = r
-                        best_combo = combo
-                return list(best_combo) if best_combo else []
-
             self.add_log("摊牌结算")
 
             # 显示手牌
             for seat, _ in result.ranking:
                 p = players_by_seat[seat]
-                hand_html = ' '.join(Table._format_card_html(c) for c in p.hand)
-                self.add_log(f"{p.name} 手牌：{hand_html}")
+                self.add_log(f"{p.name} 手牌：{p.hand_html}")
 
             # Also note folded players.
-            for p in sorted(players_by_seat.values(), key=lambda x: x.seat):
-                if p.folded:
+            for seat in self._sorted_seats:
+                p = players_by_seat.get(seat)
+                if p is not None and p.folded:
                     self.add_log(f"{p.name} 已弃牌")
 
             # Payouts + points (积分=当前筹码)
@@ -649,15 +746,14 @@ class GameRoom:
 
             self.table.stage = "waiting"
             self.table.started = False
-            self.table.action_seat = None
-            self.table._to_act = []
+            self.table._set_to_act([])
             # Reset ready to force re-ready for next hand
             for p in self.players.values():
                 p.ready = False
 
-    def public_state(self) -> dict[str, Any]:
-        players = sorted(self.players.values(), key=lambda p: p.seat)
-        state = {
+    def _table_state(self) -> dict[str, Any]:
+        players = [self._by_seat[seat] for seat in self._sorted_seats]
+        return {
             "room": self.room_id,
             "handNo": self.table.hand_no,
             "started": self.table.started,
@@ -668,7 +764,7 @@ class GameRoom:
             "utgSeat": self.table.utg_seat,
             "actionSeat": self.table.action_seat,
             "pot": self.table.pot,
-            "board": self.table.board,
+            "board": list(self.table.board),  # copied: mutated in place
             "currentBet": self.table.current_bet,
             "minRaise": self.table.min_raise,
             "players": [
@@ -688,12 +784,46 @@ class GameRoom:
                 }
                 for p in players
             ],
-            "logs": self.logs[-80:],
-            "chat": self.chat[-80:],
-            "showdown": self.table.showdown_reveal,
+            "showdown": dict(self.table.showdown_reveal),  # copied: mutated in place
         }
+
+    def snapshot(self, table_state: dict[str, Any] | None = None) -> dict[str, Any]:
+        # Pass StateDelta.state to reuse the table state delta() just built.
+        state = dict(table_state) if table_state is not None else self._table_state()
+        state["logs"] = list(islice(self.logs, max(0, len(self.logs) - 80), None))
+        state["chat"] = list(islice(self.chat, max(0, len(self.chat) - 80), None))
+        state["rev"] = self.state_rev
         return state
 
+    def delta(self) -> StateDelta:
+        # Changes since the previous delta() call. Not a read-only query: it
+        # advances state_rev and the baseline the next delta diffs against, so
+        # anything it returns must be broadcast (see server.emit_room_state) or
+        # clients silently miss those changes.
+        state = self._table_state()
+        last = self._last_state
+        changed = {k: v for k, v in state.items() if k != "players" and (k not in last or last[k] != v)}
+
+        # Same seats as last time: send only the players whose fields changed.
+        players = state["players"]
+        last_players = last.get("players")
+        if last_players is None or [p["sid"] for p in players] != [p["sid"] for p in last_players]:
+            changed["players"] = players
+        else:
+            updates = [p for p, old in zip(players, last_players) if p != old]
+            if updates:
+                changed["playerUpdates"] = updates
+
+        self._last_state = state
+        if changed or self._new_logs or self._new_chat:
+            self.state_rev += 1
+        result = StateDelta(
+            rev=self.state_rev, changed=changed, logs=self._new_logs, chat=self._new_chat, state=state
+        )
+        self._new_logs = []
+        self._new_chat = []
+        return result
+
     def private_state(self, sid: str) -> dict[str, Any]:
         hand = self.players[sid].hand if sid in self.players else []
         return {"sid": sid, "hand": hand}
@@ -49,11 +49,31 @@ def get_room(room_id: str) -> GameRoom:
 
 
 def emit_room_state(room: GameRoom):
-    public_state = room.public_state()
-    socketio.emit("room_state", public_state, to=room.room_id)
+    prev_rev = room.state_rev
+    delta = room.delta()
 
+    # Clients that missed earlier broadcasts (e.g. just joined) get a full snapshot;
+    # everyone else only receives what changed.
+    snapshot = None
     for player in room.players.values():
-        socketio.emit("private_state", room.private_state(player.sid), to=player.sid)
+        if player.synced_rev != prev_rev:
+            if snapshot is None:
+                snapshot = room.snapshot(delta.state)
+            socketio.emit("room_state", snapshot, to=player.sid)
+        player.synced_rev = room.state_rev
+
+    if delta.changed:
+        socketio.emit("room_delta", {"rev": delta.rev, **delta.changed}, to=room.room_id)
+    if delta.logs:
+        socketio.emit("log_append", {"rev": delta.rev, "entries": delta.logs}, to=room.room_id)
+    if delta.chat:
+        socketio.emit("chat_append", {"rev": delta.rev, "entries": delta.chat}, to=room.room_id)
+
+    # Hands only change when a new hand is dealt.
+    for player in room.players.values():
+        if player.synced_hand_no != room.table.hand_no:
+            socketio.emit("private_state", room.private_state(player.sid), to=player.sid)
+            player.synced_hand_no = room.table.hand_no
 
 
 @socketio.on("connect")
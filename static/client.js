@@ -3,6 +3,7 @@ let currentRoom = null;
 let mySid = null;
 let myHand = [];
 let lastPublic = null;
+let snapshotRev = -1;
 
 const $ = (id) => document.getElementById(id);
 
@@ -247,9 +248,32 @@ function initSocket() {
   socket.on("hello", () => {});
 
   socket.on("room_state", (state) => {
+    snapshotRev = state.rev;
     renderState(state);
   });
 
+  // Incremental updates; anything already covered by the last snapshot is skipped.
+  socket.on("room_delta", (delta) => {
+    if (!lastPublic || delta.rev <= snapshotRev) return;
+    const { playerUpdates, ...rest } = delta;
+    let players = rest.players || lastPublic.players || [];
+    if (playerUpdates) {
+      const bySid = new Map(playerUpdates.map((p) => [p.sid, p]));
+      players = players.map((p) => bySid.get(p.sid) || p);
+    }
+    renderState({ ...lastPublic, ...rest, players });
+  });
+
+  socket.on("log_append", (d) => {
+    if (!lastPublic || d.rev <= snapshotRev) return;
+    renderState({ ...lastPublic, logs: (lastPublic.logs || []).concat(d.entries).slice(-80) });
+  });
+
+  socket.on("chat_append", (d) => {
+    if (!lastPublic || d.rev <= snapshotRev) return;
+    renderState({ ...lastPublic, chat: (lastPublic.chat || []).concat(d.entries).slice(-80) });
+  });
+
   socket.on("private_state", (st) => {
     if (st && st.sid === mySid) {
       myHand = st.hand || [];